@@ -1,149 +1,577 @@
+import sys
 from dataclasses import dataclass
-from typing import Union
+from enum import IntEnum
+from typing import Any, Callable, ClassVar, TypeVar, Union
+
+# Types; contexts may hold Ty members or the bare ints 0/1/2, and all
+# type comparisons use == so either works
+class Ty(IntEnum):
+    UNDEF = 0
+    INT = 1
+    BOOL = 2
+
+INT, BOOL, UNDEF = Ty.INT, Ty.BOOL, Ty.UNDEF
+
+TYPE_NAMES = {UNDEF: 'undefined', INT: 'int', BOOL: 'bool'}
+
+def show_context(context: dict[str, Ty]) -> dict[str, str]:
+    return {name: TYPE_NAMES[t] for name, t in context.items()}
 
 # Expressions
-@dataclass
+# Each node class carries a unique TAG; handler tuples built by _table
+# below put each class's handler at that index
+@dataclass(slots=True, frozen=True, eq=False)
 class IntLiteral:
+    TAG: ClassVar[int] = 0
+
     value: int
 
-@dataclass
+@dataclass(slots=True, frozen=True, eq=False)
 class BoolLiteral:
+    TAG: ClassVar[int] = 1
+
     value: bool
 
-@dataclass
+@dataclass(slots=True, frozen=True, eq=False)
 class Var:
+    TAG: ClassVar[int] = 2
+
     name: str
 
-@dataclass
+@dataclass(slots=True, frozen=True, eq=False)
 class BinOp:
+    TAG: ClassVar[int] = 3
+
     op: str
     left: 'Expr'
     right: 'Expr'
 
-@dataclass
+    def __post_init__(self) -> None:
+        object.__setattr__(self, 'op', sys.intern(self.op))
+
+@dataclass(slots=True, frozen=True, eq=False)
 class UnOp:
+    TAG: ClassVar[int] = 4
+
     op: str
     expr: 'Expr'
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, 'op', sys.intern(self.op))
+
 Expr = Union[IntLiteral, BoolLiteral, Var, BinOp, UnOp]
 
 # Commands
-@dataclass
+@dataclass(slots=True, frozen=True, eq=False)
 class Assign:
+    TAG: ClassVar[int] = 5
+
     var: str
     expr: Expr
 
-@dataclass
+@dataclass(slots=True, frozen=True, eq=False)
 class Seq:
+    TAG: ClassVar[int] = 6
+
     first: 'Cmd'
     second: 'Cmd'
 
-@dataclass
+@dataclass(slots=True, frozen=True, eq=False)
 class If:
+    TAG: ClassVar[int] = 7
+
     cond: Expr
     then_branch: 'Cmd'
     else_branch: 'Cmd'
 
-@dataclass
+@dataclass(slots=True, frozen=True, eq=False)
 class While:
+    TAG: ClassVar[int] = 8
+
     cond: Expr
     body: 'Cmd'
 
 Cmd = Union[Assign, Seq, If, While]
 
+# Handler signatures for the TAG-indexed tables.  The node parameter is
+# Any because a slot only ever receives nodes whose TAG selects it.
+_ExprHandler = Callable[[Any, dict[str, Ty], dict[int, Ty] | None], Ty]
+_OkExprHandler = Callable[[Any, dict[str, Ty], dict[int, Ty] | None], Ty | None]
+_EmitExprHandler = Callable[[Any, list[str], dict[int, Ty | str]], Ty | str]
+_CmdHandler = Callable[[Any, Any, list[Cmd]], bool | None]
+_H = TypeVar('_H')
+
+_NODE_CLASSES = (IntLiteral, BoolLiteral, Var, BinOp, UnOp, Assign, Seq, If, While)
+if len({cls.TAG for cls in _NODE_CLASSES}) != len(_NODE_CLASSES):
+    raise RuntimeError("Node TAGs must be unique")
+
+# Builds a handler tuple from a class -> handler mapping, placing each
+# handler at its class's TAG.  Every other slot, including the trailing
+# one used for unknown nodes, gets the `unknown` handler.
+def _table(handlers: dict[type[Expr | Cmd], _H], unknown: _H) -> tuple[_H, ...]:
+    slots = [unknown] * (max(cls.TAG for cls in _NODE_CLASSES) + 2)
+    for cls, handler in handlers.items():
+        slots[cls.TAG] = handler
+    return tuple(slots)
+
+# Command walking
+# Every pass over commands keeps its handlers in a tuple indexed by node
+# TAG whose last slot handles unknown nodes.  Handlers push sub-commands
+# onto `stack` instead of recursing, and a handler returning False stops
+# the walk early.
+def _walk_cmd(cmd: Cmd, handlers: tuple[_CmdHandler, ...], state: object) -> bool:
+    stack: list[Cmd] = [cmd]
+    while stack:
+        node = stack.pop()
+        try:
+            handler = handlers[node.TAG]
+        except (AttributeError, IndexError, TypeError):
+            handler = handlers[-1]
+        if handler(node, state, stack) is False:
+            return False
+    return True
+
+def _push_seq(cmd: Seq, state: object, stack: list[Cmd]) -> None:
+    stack.append(cmd.second)
+    stack.append(cmd.first)
+
+def _push_if(cmd: If, state: object, stack: list[Cmd]) -> None:
+    stack.append(cmd.else_branch)
+    stack.append(cmd.then_branch)
+
+def _push_while(cmd: While, state: object, stack: list[Cmd]) -> None:
+    stack.append(cmd.body)
+
 # Type checking functions
-def type_check_expr(expr: Expr, context: dict) -> str:
-    if isinstance(expr, IntLiteral):
-        return 'int'
-    elif isinstance(expr, BoolLiteral):
-        return 'bool'
-    elif isinstance(expr, Var):
-        return context.get(expr.name, 'undefined')
-    elif isinstance(expr, UnOp):
-        et = type_check_expr(expr.expr, context)
-        if expr.op == 'not':
-            if et != 'bool':
-                raise TypeError("Expected bool in 'not'")
-            return 'bool'
-        elif expr.op == '-':
-            if et != 'int':
-                raise TypeError("Expected int in unary '-'")
-            return 'int'
-    elif isinstance(expr, BinOp):
-        lt = type_check_expr(expr.left, context)
-        rt = type_check_expr(expr.right, context)
-        if expr.op in {'+', '-', '*', '/'}:
-            if lt == rt == 'int':
-                return 'int'
-            raise TypeError("Arithmetic operations require int")
-        elif expr.op in {'=', '<='}:
-            if lt == rt == 'int':
-                return 'bool'
-            raise TypeError("Comparison requires int")
-        elif expr.op in {'and', 'or'}:
-            if lt == rt == 'bool':
-                return 'bool'
-            raise TypeError("Logical operations require bool")
+# Handlers index the next node's handler inline rather than through a
+# helper, so each expression node costs one Python frame and one call.
+def _tc_int(expr: IntLiteral, context: dict[str, Ty], cache: dict[int, Ty] | None) -> Ty:
+    return INT
+
+def _tc_bool(expr: BoolLiteral, context: dict[str, Ty], cache: dict[int, Ty] | None) -> Ty:
+    return BOOL
+
+def _tc_var(expr: Var, context: dict[str, Ty], cache: dict[int, Ty] | None) -> Ty:
+    return context.get(expr.name, UNDEF)
+
+# Operator typing rules: (operand type, result type, error message)
+_ARITH_OPS = frozenset(('+', '-', '*', '/'))
+_CMP_OPS = frozenset(('=', '<='))
+_BOOL_OPS = frozenset(('and', 'or'))
+
+_ARITH_RULE = (INT, INT, "Arithmetic operations require int")
+_CMP_RULE = (INT, BOOL, "Comparison requires int")
+_BOOL_RULE = (BOOL, BOOL, "Logical operations require bool")
+
+_BINOP_RULES = {
+    **dict.fromkeys(_ARITH_OPS, _ARITH_RULE),
+    **dict.fromkeys(_CMP_OPS, _CMP_RULE),
+    **dict.fromkeys(_BOOL_OPS, _BOOL_RULE),
+}
+
+_UNOP_RULES = {
+    'not': (BOOL, BOOL, "Expected bool in 'not'"),
+    '-': (INT, INT, "Expected int in unary '-'"),
+}
+
+def _tc_unop(expr: UnOp, context: dict[str, Ty], cache: dict[int, Ty] | None) -> Ty:
+    if cache is not None:
+        hit = cache.get(id(expr))
+        if hit is not None:
+            return hit
+    sub = expr.expr
+    try:
+        handler = _EXPR_HANDLERS[sub.TAG]
+    except (AttributeError, IndexError, TypeError):
+        handler = _tc_unknown_expr
+    et = handler(sub, context, cache)
+    rule = _UNOP_RULES.get(expr.op)
+    if rule is None:
+        raise NotImplementedError(f"Unknown expr: {expr}")
+    operand, result, message = rule
+    if et != operand:
+        raise TypeError(message)
+    if cache is not None:
+        cache[id(expr)] = result
+    return result
+
+def _tc_binop(expr: BinOp, context: dict[str, Ty], cache: dict[int, Ty] | None) -> Ty:
+    if cache is not None:
+        hit = cache.get(id(expr))
+        if hit is not None:
+            return hit
+    left = expr.left
+    right = expr.right
+    try:
+        handler = _EXPR_HANDLERS[left.TAG]
+    except (AttributeError, IndexError, TypeError):
+        handler = _tc_unknown_expr
+    lt = handler(left, context, cache)
+    try:
+        handler = _EXPR_HANDLERS[right.TAG]
+    except (AttributeError, IndexError, TypeError):
+        handler = _tc_unknown_expr
+    rt = handler(right, context, cache)
+    rule = _BINOP_RULES.get(expr.op)
+    if rule is None:
+        raise NotImplementedError(f"Unknown expr: {expr}")
+    operand, result, message = rule
+    if lt != operand or rt != operand:
+        raise TypeError(message)
+    if cache is not None:
+        cache[id(expr)] = result
+    return result
+
+def _tc_unknown_expr(expr: object, context: dict[str, Ty], cache: dict[int, Ty] | None) -> Ty:
     raise NotImplementedError(f"Unknown expr: {expr}")
 
-def type_check_cmd(cmd: Cmd, context: dict):
-    if isinstance(cmd, Assign):
-        etype = type_check_expr(cmd.expr, context)
-        context[cmd.var] = etype
-    elif isinstance(cmd, Seq):
-        type_check_cmd(cmd.first, context)
-        type_check_cmd(cmd.second, context)
-    elif isinstance(cmd, If):
-        ctype = type_check_expr(cmd.cond, context)
-        if ctype != 'bool':
-            raise TypeError("Condition in If must be bool")
-        type_check_cmd(cmd.then_branch, context)
-        type_check_cmd(cmd.else_branch, context)
-    elif isinstance(cmd, While):
-        ctype = type_check_expr(cmd.cond, context)
-        if ctype != 'bool':
-            raise TypeError("Condition in While must be bool")
-        type_check_cmd(cmd.body, context)
+_EXPR_HANDLERS: tuple[_ExprHandler, ...] = _table({
+    IntLiteral: _tc_int,
+    BoolLiteral: _tc_bool,
+    Var: _tc_var,
+    BinOp: _tc_binop,
+    UnOp: _tc_unop,
+}, _tc_unknown_expr)
+
+# Handler lookup for the entry points into an expression walk; inside a
+# walk the composite handlers index their table inline.
+def _handler(handlers: tuple[_H, ...], node: Any) -> _H:
+    try:
+        return handlers[node.TAG]
+    except (AttributeError, IndexError, TypeError):
+        return handlers[-1]
+
+# Pass a cache (id(node) -> type) to check an expression DAG that reuses
+# node objects; shared subexpressions are then walked once.  It must not
+# outlive the context it was filled against.  Trees built by a parser
+# share nothing, so by default no memoization is done.
+def type_check_expr(expr: Expr, context: dict[str, Ty], cache: dict[int, Ty] | None = None) -> Ty:
+    return _handler(_EXPR_HANDLERS, expr)(expr, context, cache)
+
+def _tc_assign(cmd: Assign, context: dict[str, Ty], stack: list[Cmd]) -> None:
+    etype = type_check_expr(cmd.expr, context)
+    context[cmd.var] = etype
+
+def _tc_if(cmd: If, context: dict[str, Ty], stack: list[Cmd]) -> None:
+    ctype = type_check_expr(cmd.cond, context)
+    if ctype != BOOL:
+        raise TypeError("Condition in If must be bool")
+    stack.append(cmd.else_branch)
+    stack.append(cmd.then_branch)
+
+def _tc_while(cmd: While, context: dict[str, Ty], stack: list[Cmd]) -> None:
+    ctype = type_check_expr(cmd.cond, context)
+    if ctype != BOOL:
+        raise TypeError("Condition in While must be bool")
+    stack.append(cmd.body)
+
+def _tc_unknown_cmd(cmd: object, context: dict[str, Ty], stack: list[Cmd]) -> None:
+    raise TypeError(f"Unknown command type: {type(cmd)}")
+
+_CMD_HANDLERS: tuple[_CmdHandler, ...] = _table({
+    Assign: _tc_assign,
+    Seq: _push_seq,
+    If: _tc_if,
+    While: _tc_while,
+}, _tc_unknown_cmd)
+
+def type_check_cmd(cmd: Cmd, context: dict[str, Ty]) -> None:
+    _walk_cmd(cmd, _CMD_HANDLERS, context)
+
+# Non-raising checker for callers that only need a yes/no answer; it
+# never builds exception objects or error messages.  Expression handlers
+# return None for an ill-typed subtree, and malformed nodes and unknown
+# operators count as ill-typed.  Leaves share the raising handlers.
+def _ok_unop(expr: UnOp, context: dict[str, Ty], cache: dict[int, Ty] | None) -> Ty | None:
+    sub = expr.expr
+    try:
+        handler = _OK_EXPR_HANDLERS[sub.TAG]
+    except (AttributeError, IndexError, TypeError):
+        handler = _ok_unknown_expr
+    et = handler(sub, context, cache)
+    rule = _UNOP_RULES.get(expr.op)
+    if rule is None or et != rule[0]:
+        return None
+    return rule[1]
+
+def _ok_binop(expr: BinOp, context: dict[str, Ty], cache: dict[int, Ty] | None) -> Ty | None:
+    left = expr.left
+    right = expr.right
+    try:
+        handler = _OK_EXPR_HANDLERS[left.TAG]
+    except (AttributeError, IndexError, TypeError):
+        handler = _ok_unknown_expr
+    lt = handler(left, context, cache)
+    try:
+        handler = _OK_EXPR_HANDLERS[right.TAG]
+    except (AttributeError, IndexError, TypeError):
+        handler = _ok_unknown_expr
+    rt = handler(right, context, cache)
+    rule = _BINOP_RULES.get(expr.op)
+    if rule is None or lt != rule[0] or rt != rule[0]:
+        return None
+    return rule[1]
+
+def _ok_unknown_expr(expr: object, context: dict[str, Ty], cache: dict[int, Ty] | None) -> Ty | None:
+    return None
+
+_OK_EXPR_HANDLERS: tuple[_OkExprHandler, ...] = _table({
+    IntLiteral: _tc_int,
+    BoolLiteral: _tc_bool,
+    Var: _tc_var,
+    BinOp: _ok_binop,
+    UnOp: _ok_unop,
+}, _ok_unknown_expr)
+
+def _ok_assign(cmd: Assign, context: dict[str, Ty], stack: list[Cmd]) -> bool:
+    expr = cmd.expr
+    try:
+        handler = _OK_EXPR_HANDLERS[expr.TAG]
+    except (AttributeError, IndexError, TypeError):
+        handler = _ok_unknown_expr
+    etype = handler(expr, context, None)
+    if etype is None:
+        return False
+    context[cmd.var] = etype
+    return True
+
+def _ok_if(cmd: If, context: dict[str, Ty], stack: list[Cmd]) -> bool:
+    cond = cmd.cond
+    if _handler(_OK_EXPR_HANDLERS, cond)(cond, context, None) != BOOL:
+        return False
+    stack.append(cmd.else_branch)
+    stack.append(cmd.then_branch)
+    return True
+
+def _ok_while(cmd: While, context: dict[str, Ty], stack: list[Cmd]) -> bool:
+    cond = cmd.cond
+    if _handler(_OK_EXPR_HANDLERS, cond)(cond, context, None) != BOOL:
+        return False
+    stack.append(cmd.body)
+    return True
+
+def _ok_unknown_cmd(cmd: object, context: dict[str, Ty], stack: list[Cmd]) -> bool:
+    return False
+
+_OK_CMD_HANDLERS: tuple[_CmdHandler, ...] = _table({
+    Assign: _ok_assign,
+    Seq: _push_seq,
+    If: _ok_if,
+    While: _ok_while,
+}, _ok_unknown_cmd)
+
+def type_check_cmd_silent(cmd: Cmd, context: dict[str, Ty]) -> bool:
+    return _walk_cmd(cmd, _OK_CMD_HANDLERS, context)
+
+# Assigned variable names in the order type_check_cmd first writes them;
+# dict.fromkeys(collect_vars(cmd), UNDEF) gives a context that is sized
+# up front and never has to grow while the program is checked.
+def _collect_assign(cmd: Assign, names: dict[str, None], stack: list[Cmd]) -> None:
+    names[cmd.var] = None
+
+def _collect_unknown(cmd: object, names: dict[str, None], stack: list[Cmd]) -> None:
+    pass
+
+_COLLECT_HANDLERS: tuple[_CmdHandler, ...] = _table({
+    Assign: _collect_assign,
+    Seq: _push_seq,
+    If: _push_if,
+    While: _push_while,
+}, _collect_unknown)
+
+def collect_vars(cmd: Cmd) -> list[str]:
+    names: dict[str, None] = {}
+    _walk_cmd(cmd, _COLLECT_HANDLERS, names)
+    return list(names)
+
+# Specialization
+# specialize() compiles one program into a straight-line Python function
+# with the same effect on the context as type_check_cmd.  Literal and
+# operator result types are resolved while generating the code; only
+# variable lookups and the checks that depend on them remain at runtime.
+def _emit_require(lines: list[str], t: Ty | str, want: Ty, message: str) -> None:
+    if isinstance(t, Ty):
+        if t != want:
+            lines.append(f"    raise TypeError({message!r})")
     else:
-        raise TypeError(f"Unknown command type: {type(cmd)}")
+        lines.append(f"    if {t} != {want.name}: raise TypeError({message!r})")
+
+def _emit_int(expr: IntLiteral, lines: list[str], memo: dict[int, Ty | str]) -> Ty | str:
+    return INT
+
+def _emit_bool(expr: BoolLiteral, lines: list[str], memo: dict[int, Ty | str]) -> Ty | str:
+    return BOOL
+
+def _emit_var(expr: Var, lines: list[str], memo: dict[int, Ty | str]) -> Ty | str:
+    t = f"t{len(lines)}"
+    lines.append(f"    {t} = ctx.get({expr.name!r}, UNDEF)")
+    return t
+
+def _emit_unop(expr: UnOp, lines: list[str], memo: dict[int, Ty | str]) -> Ty | str:
+    hit = memo.get(id(expr))
+    if hit is not None:
+        return hit
+    sub = expr.expr
+    try:
+        handler = _EMIT_EXPR_HANDLERS[sub.TAG]
+    except (AttributeError, IndexError, TypeError):
+        handler = _emit_unknown_expr
+    et = handler(sub, lines, memo)
+    rule = _UNOP_RULES.get(expr.op)
+    if rule is None:
+        return _emit_unknown_expr(expr, lines, memo)
+    operand, result, message = rule
+    _emit_require(lines, et, operand, message)
+    memo[id(expr)] = result
+    return result
+
+def _emit_binop(expr: BinOp, lines: list[str], memo: dict[int, Ty | str]) -> Ty | str:
+    hit = memo.get(id(expr))
+    if hit is not None:
+        return hit
+    left = expr.left
+    right = expr.right
+    try:
+        handler = _EMIT_EXPR_HANDLERS[left.TAG]
+    except (AttributeError, IndexError, TypeError):
+        handler = _emit_unknown_expr
+    lt = handler(left, lines, memo)
+    try:
+        handler = _EMIT_EXPR_HANDLERS[right.TAG]
+    except (AttributeError, IndexError, TypeError):
+        handler = _emit_unknown_expr
+    rt = handler(right, lines, memo)
+    rule = _BINOP_RULES.get(expr.op)
+    if rule is None:
+        return _emit_unknown_expr(expr, lines, memo)
+    operand, result, message = rule
+    _emit_require(lines, lt, operand, message)
+    _emit_require(lines, rt, operand, message)
+    memo[id(expr)] = result
+    return result
+
+def _emit_unknown_expr(expr: object, lines: list[str], memo: dict[int, Ty | str]) -> Ty | str:
+    lines.append(f"    raise NotImplementedError({f'Unknown expr: {expr}'!r})")
+    return UNDEF
+
+_EMIT_EXPR_HANDLERS: tuple[_EmitExprHandler, ...] = _table({
+    IntLiteral: _emit_int,
+    BoolLiteral: _emit_bool,
+    Var: _emit_var,
+    BinOp: _emit_binop,
+    UnOp: _emit_unop,
+}, _emit_unknown_expr)
+
+# Memo entries are only valid within one statement, so each command
+# handler starts a fresh one
+def _emit_assign(cmd: Assign, lines: list[str], stack: list[Cmd]) -> None:
+    expr = cmd.expr
+    t = _handler(_EMIT_EXPR_HANDLERS, expr)(expr, lines, {})
+    lines.append(f"    ctx[{cmd.var!r}] = {t.name if isinstance(t, Ty) else t}")
+
+def _emit_if(cmd: If, lines: list[str], stack: list[Cmd]) -> None:
+    cond = cmd.cond
+    ct = _handler(_EMIT_EXPR_HANDLERS, cond)(cond, lines, {})
+    _emit_require(lines, ct, BOOL, "Condition in If must be bool")
+    _push_if(cmd, lines, stack)
+
+def _emit_while(cmd: While, lines: list[str], stack: list[Cmd]) -> None:
+    cond = cmd.cond
+    ct = _handler(_EMIT_EXPR_HANDLERS, cond)(cond, lines, {})
+    _emit_require(lines, ct, BOOL, "Condition in While must be bool")
+    _push_while(cmd, lines, stack)
+
+def _emit_unknown_cmd(cmd: object, lines: list[str], stack: list[Cmd]) -> None:
+    lines.append(f"    raise TypeError({f'Unknown command type: {type(cmd)}'!r})")
+
+_EMIT_CMD_HANDLERS: tuple[_CmdHandler, ...] = _table({
+    Assign: _emit_assign,
+    Seq: _push_seq,
+    If: _emit_if,
+    While: _emit_while,
+}, _emit_unknown_cmd)
+
+def specialize(cmd: Cmd) -> Callable[[dict[str, Ty]], None]:
+    lines: list[str] = ["def _checked(ctx):", "    pass"]
+    _walk_cmd(cmd, _EMIT_CMD_HANDLERS, lines)
+    namespace: dict[str, Any] = {'INT': INT, 'BOOL': BOOL, 'UNDEF': UNDEF}
+    exec(compile("\n".join(lines), "<specialized>", "exec"), namespace)
+    return namespace['_checked']
 
 # TESTING
-def run_tests():
+# Test programs are built once at import so repeated runs reuse them
+_PROG1 = Seq(
+    Assign("a", IntLiteral(5)),
+    Assign("b", BinOp("+", Var("a"), IntLiteral(10)))
+)
+
+_PROG2 = Seq(
+    Assign("flag", BoolLiteral(True)),
+    If(
+        BinOp("and", Var("flag"), BoolLiteral(False)),
+        Assign("result", IntLiteral(1)),
+        Assign("result", IntLiteral(0))
+    )
+)
+
+_PROG3 = Assign("c", BinOp("and", IntLiteral(1), BoolLiteral(True)))
+
+_PROG4 = Seq(
+    Assign("v", IntLiteral(3)),
+    Assign("v", BoolLiteral(True))  # Optional stricter enforcement
+)
+
+_PROG5 = While(
+    BinOp("<=", Var("x"), IntLiteral(10)),
+    Assign("x", BinOp("+", Var("x"), IntLiteral(1)))
+)
+
+_PROG6 = Seq(
+    Assign("d", IntLiteral(1)),
+    Assign("e", BinOp("%", Var("d"), IntLiteral(2)))
+)
+
+_PROG7 = Seq(
+    While(
+        BinOp("<=", Var("i"), IntLiteral(3)),
+        Seq(
+            Assign("i", BinOp("+", Var("i"), IntLiteral(1))),
+            If(
+                BinOp("=", Var("i"), IntLiteral(2)),
+                Assign("hit", BoolLiteral(True)),
+                Assign("miss", BoolLiteral(True))
+            )
+        )
+    ),
+    Seq(
+        Assign("i", IntLiteral(0)),
+        Assign("done", BoolLiteral(True))
+    )
+)
+
+def run_tests() -> None:
     print("Running Type Checker Tests...\n")
 
     # Test 1: Valid integer assignment and arithmetic
     try:
-        prog1 = Seq(
-            Assign("a", IntLiteral(5)),
-            Assign("b", BinOp("+", Var("a"), IntLiteral(10)))
-        )
-        context1 = {}
-        type_check_cmd(prog1, context1)
-        print("Test 1 Passed:", context1)
+        context1 = dict.fromkeys(collect_vars(_PROG1), UNDEF)
+        type_check_cmd(_PROG1, context1)
+        print("Test 1 Passed:", show_context(context1))
     except Exception as e:
         print("Test 1 Failed:", e)
 
     # Test 2: Valid boolean logic and if statement
     try:
-        prog2 = Seq(
-            Assign("flag", BoolLiteral(True)),
-            If(
-                BinOp("and", Var("flag"), BoolLiteral(False)),
-                Assign("result", IntLiteral(1)),
-                Assign("result", IntLiteral(0))
-            )
-        )
-        context2 = {}
-        type_check_cmd(prog2, context2)
-        print("Test 2 Passed:", context2)
+        context2 = dict.fromkeys(collect_vars(_PROG2), UNDEF)
+        type_check_cmd(_PROG2, context2)
+        print("Test 2 Passed:", show_context(context2))
     except Exception as e:
         print("Test 2 Failed:", e)
 
     # Test 3: Invalid use of integer in boolean operation
     try:
-        prog3 = Assign("c", BinOp("and", IntLiteral(1), BoolLiteral(True)))
-        context3 = {}
-        type_check_cmd(prog3, context3)
+        context3 = dict.fromkeys(collect_vars(_PROG3), UNDEF)
+        type_check_cmd(_PROG3, context3)
         print("Test 3 Failed: Expected TypeError")
     except TypeError as e:
         print("Test 3 Passed:", e)
@@ -152,13 +580,9 @@ def run_tests():
 
     # Test 4: Incompatible variable reassignment (if enforcing strict typing)
     try:
-        prog4 = Seq(
-            Assign("v", IntLiteral(3)),
-            Assign("v", BoolLiteral(True))  # Optional stricter enforcement
-        )
-        context4 = {}
-        type_check_cmd(prog4, context4)
-        print("Test 4 Passed (allowed reassignment):", context4)
+        context4 = dict.fromkeys(collect_vars(_PROG4), UNDEF)
+        type_check_cmd(_PROG4, context4)
+        print("Test 4 Passed (allowed reassignment):", show_context(context4))
     except TypeError as e:
         print("Test 4 Passed (caught type error):", e)
     except Exception as e:
@@ -166,16 +590,79 @@ def run_tests():
 
     # Test 5: Valid while loop with boolean condition
     try:
-        prog5 = While(
-            BinOp("<=", Var("x"), IntLiteral(10)),
-            Assign("x", BinOp("+", Var("x"), IntLiteral(1)))
-        )
-        context5 = {"x": "int"}
-        type_check_cmd(prog5, context5)
-        print("Test 5 Passed:", context5)
+        context5 = {"x": INT}
+        type_check_cmd(_PROG5, context5)
+        print("Test 5 Passed:", show_context(context5))
     except Exception as e:
         print("Test 5 Failed:", e)
 
+    # Test 6: Specialized checker agrees with type_check_cmd
+    try:
+        checked = specialize(_PROG2)
+        context6: dict[str, Ty] = {}
+        checked(context6)
+        expected6: dict[str, Ty] = {}
+        type_check_cmd(_PROG2, expected6)
+        if context6 != expected6:
+            raise AssertionError(f"{show_context(context6)} != {show_context(expected6)}")
+        print("Test 6 Passed:", show_context(context6))
+    except Exception as e:
+        print("Test 6 Failed:", e)
+
+    # Test 7: Silent checker reports well-typedness without raising
+    try:
+        results7 = [type_check_cmd_silent(prog, {"x": INT}) for prog in (_PROG1, _PROG3, _PROG5)]
+        if results7 != [True, False, True]:
+            raise AssertionError(f"unexpected results {results7}")
+        print("Test 7 Passed:", results7)
+    except Exception as e:
+        print("Test 7 Failed:", e)
+
+    # Test 8: Specialized checker raises the same errors as type_check_cmd
+    try:
+        errors8 = []
+        for prog in (_PROG3, _PROG6):
+            raised: list[tuple[str, str] | None] = []
+            for check in (lambda ctx: type_check_cmd(prog, ctx), specialize(prog)):
+                try:
+                    check({})
+                    raised.append(None)
+                except Exception as e:
+                    raised.append((type(e).__name__, str(e)))
+            if raised[0] is None or raised[0] != raised[1]:
+                raise AssertionError(f"{raised[0]} != {raised[1]}")
+            errors8.append(raised[0][0])
+        print("Test 8 Passed:", errors8)
+    except Exception as e:
+        print("Test 8 Failed:", e)
+
+    # Test 9: Memo cache checks an expression DAG with shared subtrees
+    try:
+        dag: Expr = IntLiteral(1)
+        for _ in range(40):
+            dag = BinOp("+", dag, dag)
+        cache9: dict[int, Ty] = {}
+        result9 = type_check_expr(dag, {}, cache9)
+        if result9 != INT or len(cache9) != 40:
+            raise AssertionError(f"got {result9!r} with {len(cache9)} cached nodes")
+        print("Test 9 Passed:", TYPE_NAMES[result9])
+    except Exception as e:
+        print("Test 9 Failed:", e)
+
+    # Test 10: collect_vars lists assigned names in first-write order
+    try:
+        cases10 = [
+            (_PROG2, ['flag', 'result']),
+            (_PROG7, ['i', 'hit', 'miss', 'done']),
+        ]
+        for prog, expected in cases10:
+            names = collect_vars(prog)
+            if names != expected:
+                raise AssertionError(f"{names} != {expected}")
+        print("Test 10 Passed:", [collect_vars(prog) for prog, _ in cases10])
+    except Exception as e:
+        print("Test 10 Failed:", e)
+
 
 if __name__ == "__main__":
     run_tests()